@@ -5,42 +5,471 @@ Serves the static files and provides basic API endpoints
 """
 
 import http.server
-import socketserver
 import json
 import urllib.parse
 import os
+import stat
 import sys
+import socket
+import time
+import gzip
+import hmac
+import hashlib
+import queue
+import logging
+import logging.handlers
 from datetime import datetime
+from email.utils import formatdate
+from secrets import token_urlsafe
 import mimetypes
+import re
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    # orjson is optional; fall back to the stdlib codec with the same bytes-in/bytes-out shape
+    orjson = None
+
+    def _dumps(data):
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+    _loads = json.loads
+
+try:
+    import brotli
+except ImportError:
+    # brotli is optional; gzip alone still covers every browser
+    brotli = None
+
+STATIC_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Access logging is on for development; set ATHLETEAI_ACCESS_LOG=0 to turn it off.
+# Error lines (send_error, timeouts) are always logged.
+_ACCESS_LOG_ENABLED = os.environ.get('ATHLETEAI_ACCESS_LOG', '1') != '0'
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', '%Y-%m-%d %H:%M:%S'))
+# Writes directly until main() moves the stream handler onto a listener thread
+_logger = logging.getLogger('athleteai.server')
+_logger.addHandler(_log_handler)
+_logger.setLevel(logging.INFO)
+_logger.propagate = False
+
+
+def _start_log_listener():
+    """Route log records through a queue so request threads never write to stdout themselves"""
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, _log_handler)
+    listener.start()
+    _logger.removeHandler(_log_handler)
+    _logger.addHandler(queue_handler)
+    return listener, queue_handler
+
+
+def _stop_log_listener(listener, queue_handler):
+    """Drain the log queue and go back to writing records directly"""
+    _logger.removeHandler(queue_handler)
+    _logger.addHandler(_log_handler)
+    listener.stop()
+
+# Headers added to every response, pre-encoded so end_headers can append them in one go
+_CORS_HEADER_BLOB = (
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Methods: GET, POST, PUT, DELETE, OPTIONS\r\n'
+    b'Access-Control-Allow-Headers: Content-Type, Authorization\r\n'
+)
+
+# Caching policies: API responses and error pages are never cached, static assets whose
+# file name carries a content hash are cached for a year, everything else is revalidated
+# against its ETag/Last-Modified on each use
+_NO_CACHE_HEADER_BLOB = (
+    b'Cache-Control: no-cache, no-store, must-revalidate\r\n'
+    b'Pragma: no-cache\r\n'
+    b'Expires: 0\r\n'
+)
+_REVALIDATE_HEADER_BLOB = b'Cache-Control: no-cache\r\n'
+_FAR_FUTURE_HEADER_BLOB = (
+    b'Cache-Control: public, max-age=31536000, immutable\r\n'
+    b'Expires: %s\r\n' % formatdate(time.time() + 31536000, usegmt=True).encode('ascii')
+)
+_LONG_CACHE_EXTENSIONS = frozenset(('.js', '.css', '.png', '.jpg', '.ico', '.woff2', '.svg'))
+# e.g. app.3f9a1c2b.js: a new build gets a new name, so the old URL can never go stale
+_FINGERPRINTED_NAME = re.compile(r'[.-][0-9a-f]{8,}\.[^./]+$')
+# CORS headers, caching policy and the blank line that ends the header block, per policy
+_HEADER_TRAILERS = {
+    blob: _CORS_HEADER_BLOB + blob + b'\r\n'
+    for blob in (_NO_CACHE_HEADER_BLOB, _REVALIDATE_HEADER_BLOB, _FAR_FUTURE_HEADER_BLOB)
+}
+
+
+def _cache_headers(path):
+    """Pick the caching headers for a request path"""
+    path = path.partition('?')[0]
+    if path.startswith('/api/'):
+        return _NO_CACHE_HEADER_BLOB
+    if os.path.splitext(path)[1].lower() in _LONG_CACHE_EXTENSIONS and _FINGERPRINTED_NAME.search(path):
+        return _FAR_FUTURE_HEADER_BLOB
+    return _REVALIDATE_HEADER_BLOB
+
+
+# Static files loaded into memory at startup, keyed by URL path:
+# (file path, mtime_ns, {encoding: (etag, 200 payload, HEAD payload, 304 payload)})
+_STATIC_FILES = {}
+_COMPRESSIBLE_EXTENSIONS = frozenset(('.html', '.css', '.js', '.svg', '.json'))
+# Bigger files are left to SimpleHTTPRequestHandler, which streams them with sendfile()
+_STATIC_MAX_SIZE = 1 << 20
+
+
+def _compress_variants(data):
+    """Return {encoding: bytes} for data, keeping only the encodings that actually shrink it"""
+    variants = {'identity': data}
+    compressed = gzip.compress(data, 9, mtime=0)
+    if len(compressed) < len(data):
+        variants['gzip'] = compressed
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=11)
+        if len(compressed) < len(data):
+            variants['br'] = compressed
+    return variants
+
+
+def _pick_encoding(accept_encoding, available):
+    """Pick the encoding in available with the highest q-value an Accept-Encoding header gives"""
+    qvalues = {}
+    for item in accept_encoding.split(','):
+        coding, *params = item.split(';')
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding.strip().lower()] = q
+    # '*' only covers codings the header does not name; identity is acceptable unless refused
+    default = qvalues.get('*')
+    best, best_q = 'identity', 0.0
+    # On equal q-values br beats gzip beats identity
+    for encoding in ('br', 'gzip', 'identity'):
+        if encoding not in available:
+            continue
+        q = qvalues.get(encoding, default)
+        if q is None:
+            q = 1.0 if encoding == 'identity' else 0.0
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _etag_matches(if_none_match, etag):
+    """Check an If-None-Match header value against an ETag (weak comparison)"""
+    if if_none_match.strip() == '*':
+        return True
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def _guess_type(path):
+    """Content type for a file path, shared by the in-memory and on-disk responses"""
+    # Same lookup as SimpleHTTPRequestHandler.guess_type: its extensions_map first, so e.g.
+    # .gz is application/gzip rather than whatever mimetypes makes of the inner extension
+    extensions_map = http.server.SimpleHTTPRequestHandler.extensions_map
+    ext = os.path.splitext(path)[1]
+    content_type = extensions_map.get(ext) or extensions_map.get(ext.lower())
+    if content_type is None:
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    return content_type
+
+
+def _static_payloads(url_path, file_path, body, encoding, last_modified, etag):
+    """Build the (etag, 200 payload, HEAD payload, 304 payload) tuple for one file variant
+    
+    Payloads start after Date. The HEAD payload is the 200 headers without the body.
+    """
+    validators = bytearray()
+    validators += b'ETag: %s\r\n' % etag.encode('ascii')
+    validators += b'Last-Modified: %s\r\n' % last_modified.encode('latin-1')
+    validators += b'Vary: Accept-Encoding\r\n'
+    validators += _CORS_HEADER_BLOB
+    validators += _cache_headers(url_path)
+    validators += b'\r\n'
+    
+    content_type = _guess_type(file_path)
+    buf = bytearray()
+    buf += b'Content-Type: %s\r\n' % content_type.encode('latin-1')
+    if encoding != 'identity':
+        buf += b'Content-Encoding: %s\r\n' % encoding.encode('latin-1')
+    buf += b'Content-Length: %d\r\n' % len(body)
+    buf += validators
+    head = bytes(buf)
+    buf += body
+    return etag, bytes(buf), head, bytes(validators)
+
+
+def _load_static_file(url_path, file_path):
+    """Read one file into memory and return its _STATIC_FILES entry
+    
+    Returns None for anything that is not a regular file or is too big; those paths are left to
+    SimpleHTTPRequestHandler. Raises OSError if the file cannot be read.
+    """
+    # Check before opening: open() on a FIFO would block until a writer shows up
+    st = os.stat(file_path)
+    if not stat.S_ISREG(st.st_mode) or st.st_size > _STATIC_MAX_SIZE:
+        return None
+    with open(file_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode) or st.st_size > _STATIC_MAX_SIZE:
+            return None
+        data = f.read()
+    last_modified = formatdate(st.st_mtime_ns / 1e9, usegmt=True)
+    digest = hashlib.sha1(data).hexdigest()
+    if os.path.splitext(file_path)[1].lower() in _COMPRESSIBLE_EXTENSIONS:
+        variants = _compress_variants(data)
+    else:
+        variants = {'identity': data}
+    # Strong ETags must differ per content-coding, so encoded variants get a suffix
+    payloads = {
+        encoding: _static_payloads(
+            url_path, file_path, body, encoding, last_modified,
+            '"%s"' % digest if encoding == 'identity' else '"%s-%s"' % (digest, encoding)
+        )
+        for encoding, body in variants.items()
+    }
+    return file_path, st.st_mtime_ns, payloads
+
+
+def _load_static_directory(root):
+    """Load the files under root into memory, keyed by the URL path they are served at"""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != '__pycache__']
+        for name in filenames:
+            if name.startswith('.'):
+                continue
+            file_path = os.path.join(dirpath, name)
+            url_path = '/' + os.path.relpath(file_path, root).replace(os.sep, '/')
+            if '?' in url_path or '#' in url_path:
+                # Only reachable percent-encoded; leave such oddities to translate_path
+                continue
+            try:
+                entry = _load_static_file(url_path, file_path)
+            except OSError:
+                # Dangling symlinks, unreadable files and the like: serve (or 404) them from disk
+                entry = None
+            if entry is None:
+                continue
+            files[url_path] = entry
+            if name == 'index.html':
+                # The directory URL serves its index page too
+                files[url_path[:-len(name)]] = entry
+    return files
+
+
+def _static_key(path):
+    """Turn a request path into its _STATIC_FILES key, decoding it as translate_path does"""
+    path = path.split('?', 1)[0].split('#', 1)[0]
+    try:
+        return urllib.parse.unquote(path, errors='surrogatepass')
+    except UnicodeDecodeError:
+        return urllib.parse.unquote(path)
+
+def _hash_password(password):
+    """Digest a password for constant-time comparison (demo accounts only, not a password KDF)"""
+    return hashlib.sha256(password.encode('utf-8')).digest()
+
+
+# Demo authentication
+_DEMO_USERS = {
+    'athlete@demo.com': {'password_hash': _hash_password('password123'), 'role': 'athlete', 'name': 'Demo Athlete'},
+    'coach@demo.com': {'password_hash': _hash_password('password123'), 'role': 'coach', 'name': 'Demo Coach'},
+    'admin@demo.com': {'password_hash': _hash_password('password123'), 'role': 'admin', 'name': 'Demo Admin'}
+}
+# Compared against for unknown emails so they cost the same as a wrong password
+_UNKNOWN_USER_HASH = _hash_password('')
+
+
+def _json_payload(body, encoding=None):
+    """Build everything after the Date header of a JSON response: headers, blank line, body
+    
+    Pass encoding for a body that exists in several encodings so caches vary on it.
+    """
+    buf = bytearray()
+    buf += b'Content-Type: application/json\r\n'
+    if encoding is not None:
+        if encoding != 'identity':
+            buf += b'Content-Encoding: %s\r\n' % encoding.encode('latin-1')
+        buf += b'Vary: Accept-Encoding\r\n'
+    buf += b'Content-Length: %d\r\n' % len(body)
+    buf += _CORS_HEADER_BLOB
+    buf += _NO_CACHE_HEADER_BLOB
+    buf += b'\r\n'
+    buf += body
+    return bytes(buf)
+
+
+# Static API payloads, serialized once at import
+_CONFIG_BYTES = _dumps({
+    'appName': 'AthleteAI',
+    'version': '1.0.0',
+    'features': {
+        'aiTesting': True,
+        'faceRecognition': True,
+        'offlineMode': True,
+        'pwa': True
+    }
+})
+_CONFIG_PAYLOADS = {
+    encoding: _json_payload(body, encoding)
+    for encoding, body in _compress_variants(_CONFIG_BYTES).items()
+}
+_HEALTH_TEMPLATE = b'{"status":"healthy","timestamp":"%b"}'
+
+# (monotonic_ns, iso_bytes), swapped as a whole so threads never see a torn update
+_now_cache = (0, b'')
+
+
+def _now():
+    """Return the current time as ISO bytes, refreshed at most once per millisecond"""
+    global _now_cache
+    cache = _now_cache
+    ns = time.monotonic_ns()
+    if ns - cache[0] > 1_000_000:
+        cache = _now_cache = (ns, datetime.now().isoformat().encode('ascii'))
+    return cache[1]
+
+# (unix_second, http_date, date_header_line), swapped as a whole like _now_cache
+_http_date_cache = (0, '', b'')
+
+
+def _http_date():
+    """Return (http_date, date_header_line) for the current time, formatted at most once per second"""
+    global _http_date_cache
+    cache = _http_date_cache
+    second = int(time.time())
+    if second != cache[0]:
+        date = formatdate(second, usegmt=True)
+        cache = _http_date_cache = (second, date, b'Date: %s\r\n' % date.encode('ascii'))
+    return cache[1], cache[2]
 
 class AthleteAIHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler for AthleteAI platform"""
     
+    # Every response carries a Content-Length, so connections can be kept alive
+    protocol_version = 'HTTP/1.1'
+    # Kept-alive connections each hold a thread; close any that sit idle or stall this long
+    timeout = 30
+    # Status line and Server header of send_payload responses, encoded once
+    _OK_PREFIX = b'%s 200 OK\r\nServer: %s %s\r\n' % (
+        protocol_version.encode('ascii'),
+        http.server.SimpleHTTPRequestHandler.server_version.encode('ascii'),
+        http.server.SimpleHTTPRequestHandler.sys_version.encode('ascii')
+    )
+    _STATUS_PREFIXES = {
+        200: _OK_PREFIX,
+        304: _OK_PREFIX.replace(b' 200 OK\r\n', b' 304 Not Modified\r\n', 1)
+    }
+    # Caching headers forced for the response being built; None picks them from the path
+    cache_headers = None
+    # Set while an interim (1xx) response is being built, e.g. the 100 Continue of handle_expect_100
+    interim_response = False
+    
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=os.path.dirname(os.path.abspath(__file__)), **kwargs)
+        super().__init__(*args, directory=STATIC_ROOT, **kwargs)
+    
+    def send_response_only(self, code, message=None):
+        self.interim_response = code < 200
+        super().send_response_only(code, message)
     
     def end_headers(self):
-        # Add CORS headers for development
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
-        super().end_headers()
+        # Add CORS headers for development and flush the header buffer directly, as
+        # BaseHTTPRequestHandler.end_headers/flush_headers would
+        if self.interim_response:
+            # Interim responses are just the status line; the final response carries the headers
+            self.interim_response = False
+            trailer = b'\r\n'
+        else:
+            trailer = _HEADER_TRAILERS[self.cache_headers or _cache_headers(self.path)]
+            self.cache_headers = None
+        if self.request_version != 'HTTP/0.9':
+            self._headers_buffer.append(trailer)
+            self.wfile.write(b''.join(self._headers_buffer))
+            self._headers_buffer = []
+    
+    def send_error(self, code, message=None, explain=None):
+        # Error pages must not inherit the long-lived caching of the asset they stand in for
+        self.cache_headers = _NO_CACHE_HEADER_BLOB
+        super().send_error(code, message, explain)
+    
+    def date_time_string(self, timestamp=None):
+        # Every response sends a Date header; reuse the per-second cache instead of reformatting
+        if timestamp is None:
+            return _http_date()[0]
+        return super().date_time_string(timestamp)
     
     def do_OPTIONS(self):
         """Handle preflight requests"""
         self.send_response(200)
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def do_GET(self):
         """Handle GET requests"""
         if self.path.startswith('/api/'):
             self.handle_api_get()
-        else:
+        elif not self.send_static():
             super().do_GET()
     
+    def do_HEAD(self):
+        """Handle HEAD requests with the same headers a GET would get"""
+        if not self.send_static(head_only=True):
+            super().do_HEAD()
+    
+    def send_static(self, head_only=False):
+        """Serve a static file from memory; return False to fall back to the file on disk"""
+        url_path = _static_key(self.path)
+        entry = _STATIC_FILES.get(url_path)
+        if_none_match = self.headers.get('If-None-Match')
+        # Date-only conditional requests go to SimpleHTTPRequestHandler, which answers them
+        if entry is None or (if_none_match is None and 'If-Modified-Since' in self.headers):
+            return False
+        try:
+            if os.stat(entry[0]).st_mtime_ns != entry[1]:
+                entry = _load_static_file(url_path, entry[0])
+        except OSError:
+            entry = None
+        if entry is None:
+            _STATIC_FILES.pop(url_path, None)
+            return False
+        _STATIC_FILES[url_path] = entry
+        encoding = _pick_encoding(self.headers.get('Accept-Encoding', ''), entry[2])
+        etag, ok, head, not_modified = entry[2][encoding]
+        if if_none_match is not None and _etag_matches(if_none_match, etag):
+            self.send_payload(not_modified, 304)
+        else:
+            self.send_payload(head if head_only else ok)
+        return True
+    
+    def guess_type(self, path):
+        # One lookup for both paths, so a file's Content-Type does not depend on the cache
+        return _guess_type(path)
+    
+    def copyfile(self, source, outputfile):
+        """Copy a static file to the client with sendfile() instead of a userspace read/write loop"""
+        if outputfile is self.wfile:
+            # socket.sendfile uses os.sendfile where it can and falls back to send() itself,
+            # e.g. on Windows or for non-regular files; wfile is unbuffered, so nothing is pending
+            self.connection.sendfile(source)
+        else:
+            super().copyfile(source, outputfile)
+    
     def do_POST(self):
         """Handle POST requests"""
         if self.path.startswith('/api/'):
@@ -50,74 +479,79 @@ class AthleteAIHandler(http.server.SimpleHTTPRequestHandler):
     
     def handle_api_get(self):
         """Handle API GET requests"""
+        handler = self._GET_ROUTES.get(self.path.partition('?')[0])
+        if handler is None:
+            self.send_error(404, "API endpoint not found")
+            return
         try:
-            if self.path == '/api/health':
-                self.send_json_response({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
-            elif self.path == '/api/config':
-                config = {
-                    'appName': 'AthleteAI',
-                    'version': '1.0.0',
-                    'features': {
-                        'aiTesting': True,
-                        'faceRecognition': True,
-                        'offlineMode': True,
-                        'pwa': True
-                    }
-                }
-                self.send_json_response(config)
-            else:
-                self.send_error(404, "API endpoint not found")
+            handler(self)
         except Exception as e:
             self.send_error(500, f"Internal server error: {str(e)}")
     
     def handle_api_post(self):
         """Handle API POST requests"""
+        handler = self._POST_ROUTES.get(self.path.partition('?')[0])
+        if handler is None:
+            self.send_error(404, "API endpoint not found")
+            return
+        content_length = self.headers.get('Content-Length')
+        if content_length is None:
+            self.send_error(411, "Content-Length required")
+            return
+        # Plain ASCII digits only; int() would also take '1_0', '+5', padding and non-ASCII digits
+        if not (content_length.isascii() and content_length.isdigit()):
+            self.send_error(400, "Invalid Content-Length")
+            return
+        content_length = int(content_length)
         try:
-            content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-            
-            if self.path == '/api/auth/login':
-                response = self.handle_login(data)
-            elif self.path == '/api/auth/register':
-                response = self.handle_register(data)
-            elif self.path == '/api/training/sessions':
-                response = self.handle_training_session(data)
-            elif self.path == '/api/ai/analysis':
-                response = self.handle_ai_analysis(data)
-            else:
-                self.send_error(404, "API endpoint not found")
+            try:
+                data = _loads(post_data)
+            except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError both subclass it
+                self.send_error(400, "Invalid JSON")
+                return
+            # Every handler reads fields with data.get(); anything but an object is a client error
+            if not isinstance(data, dict):
+                self.send_error(400, "Expected a JSON object")
                 return
             
-            self.send_json_response(response)
+            self.send_json_response(handler(self, data))
             
-        except json.JSONDecodeError:
-            self.send_error(400, "Invalid JSON")
         except Exception as e:
             self.send_error(500, f"Internal server error: {str(e)}")
     
+    def handle_health(self):
+        """Handle health check"""
+        self.send_payload(_json_payload(_HEALTH_TEMPLATE % _now()))
+    
+    def handle_config(self):
+        """Handle client configuration request"""
+        encoding = _pick_encoding(self.headers.get('Accept-Encoding', ''), _CONFIG_PAYLOADS)
+        self.send_payload(_CONFIG_PAYLOADS[encoding])
+    
     def handle_login(self, data):
         """Handle login request"""
         email = data.get('email', '')
         password = data.get('password', '')
         
-        # Demo authentication
-        demo_users = {
-            'athlete@demo.com': {'password': 'password123', 'role': 'athlete', 'name': 'Demo Athlete'},
-            'coach@demo.com': {'password': 'password123', 'role': 'coach', 'name': 'Demo Coach'},
-            'admin@demo.com': {'password': 'password123', 'role': 'admin', 'name': 'Demo Admin'}
-        }
+        user = _DEMO_USERS.get(email)
+        try:
+            password_hash = _hash_password(password) if isinstance(password, str) else b''
+        except UnicodeEncodeError:
+            # A lone surrogate such as "\ud800" has no UTF-8 form, so it cannot match any password
+            password_hash = b''
+        known_hash = user['password_hash'] if user is not None else _UNKNOWN_USER_HASH
         
-        if email in demo_users and demo_users[email]['password'] == password:
+        if hmac.compare_digest(known_hash, password_hash) and user is not None:
             return {
                 'success': True,
                 'user': {
                     'id': f"user_{email.split('@')[0]}",
                     'email': email,
-                    'name': demo_users[email]['name'],
-                    'role': demo_users[email]['role']
+                    'name': user['name'],
+                    'role': user['role']
                 },
-                'token': f"demo_token_{datetime.now().timestamp()}"
+                'token': "demo_token_" + token_urlsafe(16)
             }
         else:
             return {'success': False, 'error': 'Invalid credentials'}
@@ -136,7 +570,7 @@ class AthleteAIHandler(http.server.SimpleHTTPRequestHandler):
         return {
             'success': True,
             'user': {
-                'id': f"user_{datetime.now().timestamp()}",
+                'id': "user_" + token_urlsafe(9),
                 'name': name,
                 'email': email,
                 'role': role
@@ -148,7 +582,7 @@ class AthleteAIHandler(http.server.SimpleHTTPRequestHandler):
         # In a real app, you would save to database
         return {
             'success': True,
-            'sessionId': f"session_{datetime.now().timestamp()}",
+            'sessionId': "session_" + token_urlsafe(9),
             'message': 'Training session saved successfully'
         }
     
@@ -157,29 +591,85 @@ class AthleteAIHandler(http.server.SimpleHTTPRequestHandler):
         # In a real app, you would process and store analysis results
         return {
             'success': True,
-            'analysisId': f"analysis_{datetime.now().timestamp()}",
+            'analysisId': "analysis_" + token_urlsafe(9),
             'message': 'AI analysis saved successfully'
         }
     
+    # API routes, looked up by exact path with any query string removed
+    _GET_ROUTES = {
+        '/api/health': handle_health,
+        '/api/config': handle_config
+    }
+    _POST_ROUTES = {
+        '/api/auth/login': handle_login,
+        '/api/auth/register': handle_register,
+        '/api/training/sessions': handle_training_session,
+        '/api/ai/analysis': handle_ai_analysis
+    }
+    
     def send_json_response(self, data):
         """Send JSON response"""
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.send_payload(_json_payload(_dumps(data)))
+    
+    def send_payload(self, payload, code=200):
+        """Send a response from a prebuilt payload (see _json_payload) without copying it"""
+        head = self._STATUS_PREFIXES[code] + _http_date()[1]
+        self.log_request(code)
+        sendmsg = getattr(self.connection, 'sendmsg', None)
+        if sendmsg is None:
+            # No writev on this platform (Windows); TCP_NODELAY keeps the two writes prompt
+            self.wfile.write(head)
+            self.wfile.write(payload)
+            return
+        # One writev() for head and body; sendmsg may send short, so resume from where it stopped
+        buffers = [memoryview(head), memoryview(payload)]
+        while buffers:
+            sent = sendmsg(buffers)
+            while buffers and sent >= len(buffers[0]):
+                sent -= len(buffers[0])
+                buffers.pop(0)
+            if buffers:
+                buffers[0] = buffers[0][sent:]
+    
+    def log_request(self, code='-', size='-'):
+        # Only access lines are optional; log_error still goes through log_message
+        if _ACCESS_LOG_ENABLED:
+            super().log_request(code, size)
     
     def log_message(self, format, *args):
-        """Custom log format"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        print(f"[{timestamp}] {format % args}")
+        """Custom log format, written to stdout by the log listener thread"""
+        _logger.info(format, *args)
+
+class AthleteAIServer(http.server.ThreadingHTTPServer):
+    """Threaded HTTP server that can share its port with other instances"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def server_bind(self):
+        # SO_REUSEPORT lets several instances bind the same port and the kernel spreads
+        # connections across them; it is not available on Windows
+        if hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+    
+    def finish_request(self, request, client_address):
+        # Static files go out as a header write followed by sendfile(); with Nagle enabled the
+        # body can wait on the client's delayed ACK for the headers, adding ~40ms per response
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().finish_request(request, client_address)
 
 def main():
     """Main server function"""
     PORT = 8000
     
+    _STATIC_FILES.update(_load_static_directory(STATIC_ROOT))
+    log_listener = _start_log_listener()
+    
     # Check if port is available
     try:
-        with socketserver.TCPServer(("", PORT), AthleteAIHandler) as httpd:
+        # One thread per connection so a slow client or kept-alive socket never stalls the API
+        with AthleteAIServer(("", PORT), AthleteAIHandler) as httpd:
             print(f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║                    AthleteAI Platform                       ║
@@ -210,6 +700,8 @@ def main():
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
         sys.exit(0)
+    finally:
+        _stop_log_listener(*log_listener)
 
 if __name__ == "__main__":
     main()